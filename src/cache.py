@@ -0,0 +1,98 @@
+import os
+import time
+from typing import Any
+
+import github_action_utils as gha_utils  # type: ignore
+import orjson
+
+
+class GitHubAPICache:
+    """Persistent on-disk cache for GitHub API responses"""
+
+    # Cached responses are re-used for a day
+    ttl = 24 * 60 * 60
+
+    def __init__(self, cache_file: str):
+        self.cache_file = cache_file
+        self._entries = self._load()
+
+    def _load(self) -> dict[str, dict[str, Any]]:
+        """Load the cache entries from the cache file"""
+        try:
+            with open(self.cache_file, "rb") as file:
+                return orjson.loads(file.read())
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as exc:
+            gha_utils.warning(
+                f"Could not read GitHub API cache from '{self.cache_file}'. "
+                f"Reason: {exc}"
+            )
+            return {}
+
+    def get(self, url: str) -> Any | None:
+        """Get the cached data for an URL if it has not expired"""
+        entry = self._entries.get(url)
+
+        if entry and time.time() - entry["fetched_at"] < self.ttl:
+            return entry["data"]
+
+        return None
+
+    def get_conditional_headers(self, url: str) -> dict[str, str]:
+        """Get the headers to revalidate an expired cache entry of an URL"""
+        entry = self._entries.get(url, {})
+        headers = {}
+
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+        return headers
+
+    def refresh(self, url: str) -> Any:
+        """Mark the cached data for an URL as fresh and return it"""
+        entry = self._entries[url]
+        entry["fetched_at"] = time.time()
+        return entry["data"]
+
+    def set(
+        self,
+        url: str,
+        data: Any,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> None:
+        """Cache the data for an URL"""
+        self._entries[url] = {
+            "fetched_at": time.time(),
+            "etag": etag,
+            "last_modified": last_modified,
+            "data": data,
+        }
+
+    def update(self, url: str, data: Any) -> None:
+        """Cache new data for an URL, keeping the validators of the cached entry"""
+        entry = self._entries.get(url, {})
+        self.set(url, data, entry.get("etag"), entry.get("last_modified"))
+
+    def save(self) -> None:
+        """Write the cache entries to the cache file"""
+        temp_file = f"{self.cache_file}.tmp"
+
+        try:
+            os.makedirs(
+                os.path.dirname(os.path.abspath(self.cache_file)), exist_ok=True
+            )
+
+            with open(temp_file, "wb") as file:
+                file.write(orjson.dumps(self._entries))
+
+            os.replace(temp_file, self.cache_file)
+        except OSError as exc:
+            gha_utils.warning(
+                f"Could not write GitHub API cache to '{self.cache_file}'. "
+                f"Reason: {exc}"
+            )
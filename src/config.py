@@ -1,11 +1,12 @@
-import json
 import os
+import stat
 import time
+from dataclasses import dataclass
 from enum import Enum
-from pathlib import Path
 from typing import Any
 
 import github_action_utils as gha_utils  # type: ignore
+import orjson
 from pydantic import Field, field_validator, model_validator
 from pydantic.fields import FieldInfo
 from pydantic_settings import (
@@ -34,36 +35,62 @@ class ReleaseType(str, Enum):
         return self.value
 
 
+# Used to make the default pull request branch name unique
+PROCESS_START_TIME = int(time.time())
+
+# Branches that can not be used as the pull request branch
+RESERVED_BRANCH_NAMES = frozenset(["main", "master"])
+
+# File extensions of workflow files
+YAML_FILE_SUFFIXES = (".yml", ".yaml")
+
+# Inputs that accept a comma separated string or a JSON list
+LIST_INPUT_FIELDS = frozenset(
+    [
+        "ignore_actions",
+        "pull_request_user_reviewers",
+        "pull_request_team_reviewers",
+        "pull_request_labels",
+        "release_types",
+        "extra_workflow_locations",
+    ]
+)
+
+
 class CustomEnvSettingsSource(EnvSettingsSource):
     def prepare_field_value(
         self, field_name: str, field: FieldInfo, value: Any, value_is_complex: bool
     ) -> Any:
-        if field_name in [
-            "ignore_actions",
-            "pull_request_user_reviewers",
-            "pull_request_team_reviewers",
-            "pull_request_labels",
-            "release_types",
-            "extra_workflow_locations",
-        ]:
+        if field_name in LIST_INPUT_FIELDS:
             if not value:
                 return None
             if value.startswith("[") and value.endswith("]"):
-                return frozenset(json.loads(value))
-            return frozenset(s.strip() for s in value.strip().split(",") if s)
+                return frozenset(orjson.loads(value))
+            return frozenset(filter(None, map(str.strip, value.split(","))))
 
         return value
 
 
-class ActionEnvironment(BaseSettings):
+@dataclass(frozen=True, slots=True)
+class ActionEnvironment:
+    """GitHub Actions environment variables"""
+
     repository: str
-    base_branch: str = Field(alias="GITHUB_REF")
+    base_branch: str
     event_name: str
     workspace: str
 
-    model_config = SettingsConfigDict(
-        case_sensitive=False, frozen=True, env_prefix="GITHUB_"
-    )
+    @classmethod
+    def from_env(cls) -> "ActionEnvironment":
+        """Read the action environment from the environment variables"""
+        # These variables are always set by GitHub Actions,
+        # no validation is needed
+        return cls(
+            repository=os.environ["GITHUB_REPOSITORY"],
+            base_branch=os.environ["GITHUB_REF"],
+            event_name=os.environ["GITHUB_EVENT_NAME"],
+            workspace=os.environ["GITHUB_WORKSPACE"],
+        )
 
 
 class Configuration(BaseSettings):
@@ -89,13 +116,12 @@ class Configuration(BaseSettings):
             ReleaseType.PATCH,
         ]
     )
-    ignore_actions: frozenset[str] = Field(
-        default_factory=frozenset, alias="INPUT_IGNORE"
-    )
-    pull_request_user_reviewers: frozenset[str] = Field(default_factory=frozenset)
-    pull_request_team_reviewers: frozenset[str] = Field(default_factory=frozenset)
-    pull_request_labels: frozenset[str] = Field(default_factory=frozenset)
-    extra_workflow_locations: frozenset[str] = Field(default_factory=frozenset)
+    ignore_actions: frozenset[str] = Field(default=frozenset(), alias="INPUT_IGNORE")
+    pull_request_user_reviewers: frozenset[str] = frozenset()
+    pull_request_team_reviewers: frozenset[str] = frozenset()
+    pull_request_labels: frozenset[str] = frozenset()
+    extra_workflow_locations: frozenset[str] = frozenset()
+    api_cache_file: str | None = None
     model_config = SettingsConfigDict(
         case_sensitive=False, frozen=True, env_prefix="INPUT_"
     )
@@ -116,19 +142,16 @@ class Configuration(BaseSettings):
             file_secret_settings,
         )
 
-    @property
-    def git_commit_author(self) -> str:
-        """git_commit_author option"""
-        return f"{self.committer_username} <{self.committer_email}>"
-
     @model_validator(mode="before")
     @classmethod
     def validate_pull_request_branch(cls, values: Any) -> Any:
-        if not values.get("pull_request_branch"):
-            values["pull_request_branch"] = f"gh-actions-update-{int(time.time())}"
-            values["force_push"] = False
-        else:
-            values["force_push"] = True
+        # A user provided branch may already exist, so it needs to be force pushed
+        pull_request_branch = values.get("pull_request_branch")
+        values["force_push"] = bool(pull_request_branch)
+
+        if not pull_request_branch:
+            values["pull_request_branch"] = f"gh-actions-update-{PROCESS_START_TIME}"
+
         return values
 
     @field_validator("release_types", mode="before")
@@ -148,17 +171,29 @@ class Configuration(BaseSettings):
     @field_validator("extra_workflow_locations")
     @classmethod
     def check_extra_workflow_locations(cls, value: frozenset[str]) -> frozenset[str]:
-        workflow_file_paths = []
+        workflow_file_paths: list[str] = []
 
         for workflow_location in value:
-            if os.path.isdir(workflow_location):
-                workflow_file_paths.extend(
-                    [str(path) for path in Path(workflow_location).rglob("*.y*ml")]
-                )
-            elif os.path.isfile(workflow_location):
-                if workflow_location.endswith(".yml") or workflow_location.endswith(
-                    ".yaml"
-                ):
+            # A single `stat` call is enough to check if
+            # the location is a directory or a file
+            try:
+                location_mode = os.stat(workflow_location).st_mode
+            except OSError:
+                location_mode = 0
+
+            if stat.S_ISDIR(location_mode):
+                for root, directories, files in os.walk(workflow_location):
+                    # Do not look for workflows inside git directories
+                    directories[:] = [
+                        directory for directory in directories if directory != ".git"
+                    ]
+                    workflow_file_paths.extend(
+                        os.path.join(root, file)
+                        for file in files
+                        if file.endswith(YAML_FILE_SUFFIXES)
+                    )
+            elif stat.S_ISREG(location_mode):
+                if workflow_location.endswith(YAML_FILE_SUFFIXES):
                     workflow_file_paths.append(workflow_location)
             else:
                 gha_utils.warning(
@@ -171,7 +206,7 @@ class Configuration(BaseSettings):
     @field_validator("pull_request_branch")
     @classmethod
     def check_pull_request_branch(cls, value: str) -> str:
-        if value.lower() in ["main", "master"]:
+        if value.lower() in RESERVED_BRANCH_NAMES:
             raise ValueError(
                 "Invalid input for `pull_request_branch` field, "
                 f"branch `{value}` can not be used as the pull request branch."
@@ -1,46 +1,77 @@
+import os
 import re
-from collections.abc import Generator
+import shutil
+import tempfile
+import threading
+from collections.abc import Callable, Generator
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from functools import cache, cached_property
+from operator import itemgetter
 from typing import Any
 
 import github_action_utils as gha_utils  # type: ignore
+import orjson
 import requests
-import yaml
-from packaging.version import LegacyVersion, Version, parse
-
-from .config import ActionEnvironment, Configuration, ReleaseType, UpdateVersionWith
+from packaging.version import LegacyVersion, Version
+
+from .cache import GitHubAPICache
+from .config import (
+    YAML_FILE_SUFFIXES,
+    ActionEnvironment,
+    Configuration,
+    ReleaseType,
+    UpdateVersionWith,
+)
 from .run_git import (
-    configure_git_author,
     configure_safe_directory,
     create_new_git_branch,
     git_commit_changes,
     git_has_changes,
 )
 from .utils import (
+    GITHUB_API_URL,
+    REQUEST_TIMEOUT,
     add_git_diff_to_job_summary,
     add_pull_request_labels,
     add_pull_request_reviewers,
     create_pull_request,
     display_whats_new,
-    get_request_headers,
+    get_latest_release,
+    get_request_session,
+    parse_version,
 )
 
 
 class GitHubActionsVersionUpdater:
     """Check for GitHub Action updates"""
 
-    github_api_url = "https://api.github.com"
+    github_api_url = GITHUB_API_URL
     github_url = "https://github.com/"
+    workflow_directory = ".github/workflows"
     workflow_action_key = "uses"
+    # Matches action versions pinned to a full commit SHA
+    commit_sha_regex = re.compile(r"[0-9a-f]{40}")
+    max_workers = 16
+    # Number of repositories queried in a single GitHub GraphQL API request
+    graphql_batch_size = 50
 
     def __init__(self, env: ActionEnvironment, user_config: Configuration):
         self.env = env
         self.user_config = user_config
+        self.api_cache = (
+            GitHubAPICache(user_config.api_cache_file)
+            if user_config.api_cache_file
+            else None
+        )
+        # GitHub REST API data fetched in advance, keyed by GitHub REST API URL
+        self._prefetched_api_data: dict[str, Any] = {}
 
     def run(self) -> None:
         """Entrypoint to the GitHub Action"""
         workflow_paths = self._get_workflow_paths()
-        updated_item_markdown_set: set[str] = set()
+        # A list keeps the pull request body in a stable order
+        updated_item_markdown_lines: list[str] = []
 
         if not workflow_paths:
             gha_utils.warning(
@@ -54,15 +85,57 @@ class GitHubActionsVersionUpdater:
                 f'Actions "{self.user_config.ignore_actions}" will be skipped'
             )
 
-        for workflow_path in workflow_paths:
-            updated_item_markdown_set = updated_item_markdown_set.union(
-                self._update_workflow(workflow_path)
+        # Collect the actions of all the workflows first, so that
+        # an action used in multiple workflows is only checked once
+        workflows = self._read_workflows(workflow_paths)
+        workflow_actions = {
+            workflow_path: self._get_workflow_actions(workflow_path, file_data)
+            - self.user_config.ignore_actions
+            for workflow_path, file_data in workflows.items()
+        }
+        action_updates = self._get_action_updates(
+            set().union(*workflow_actions.values())
+        )
+
+        workflow_updates: dict[str, dict[str, str]] = {}
+
+        for workflow_path in sorted(workflows):
+            updated_actions = {
+                action: action_updates[action][0]
+                for action in sorted(workflow_actions[workflow_path])
+                if action in action_updates
+            }
+
+            if not updated_actions:
+                continue
+
+            with gha_utils.group(f'Updating "{workflow_path}"'):
+                for action, updated_action in updated_actions.items():
+                    gha_utils.echo(f'Updating "{action}" with "{updated_action}"...')
+                    updated_item_markdown = action_updates[action][1]
+
+                    # Actions of the same repository can have the same update
+                    if updated_item_markdown not in updated_item_markdown_lines:
+                        updated_item_markdown_lines.append(updated_item_markdown)
+
+            workflow_updates[workflow_path] = updated_actions
+
+        # The workflow files are independent of each other,
+        # so they are rewritten concurrently
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            list(
+                executor.map(
+                    self._update_workflow,
+                    workflow_updates.keys(),
+                    [workflows[workflow_path] for workflow_path in workflow_updates],
+                    workflow_updates.values(),
+                )
             )
 
         if git_has_changes():
             # Use timestamp to ensure uniqueness of the new branch
             pull_request_body = "### GitHub Actions Version Updates\n" + "".join(
-                updated_item_markdown_set
+                updated_item_markdown_lines
             )
             gha_utils.append_job_summary(pull_request_body)
 
@@ -72,7 +145,8 @@ class GitHubActionsVersionUpdater:
                 )
                 git_commit_changes(
                     self.user_config.commit_message,
-                    self.user_config.git_commit_author,
+                    self.user_config.committer_username,
+                    self.user_config.committer_email,
                     self.user_config.pull_request_branch,
                     self.user_config.force_push,
                 )
@@ -109,96 +183,152 @@ class GitHubActionsVersionUpdater:
         else:
             gha_utils.notice("Everything is up-to-date! \U0001F389 \U0001F389")
 
-    def _update_workflow(self, workflow_path: str) -> set[str]:
-        """Update the workflow file with the updated data"""
-        updated_item_markdown_set: set[str] = set()
+    def _read_workflows(self, workflow_paths: set[str]) -> dict[str, str]:
+        """Read the workflow files, returns the file data of each workflow"""
+        # Workflow files are read concurrently to overlap the file I/O
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            file_data_list = list(executor.map(self._read_workflow, workflow_paths))
+
+        return {
+            workflow_path: file_data
+            for workflow_path, file_data in zip(workflow_paths, file_data_list)
+            if file_data is not None
+        }
 
+    def _read_workflow(self, workflow_path: str) -> str | None:
+        """Read a workflow file, returns None if the file does not exist"""
         try:
-            with open(workflow_path, "r+") as file, gha_utils.group(
-                f'Checking "{workflow_path}" for updates'
+            with open(workflow_path) as file:
+                return file.read()
+        except FileNotFoundError:
+            gha_utils.warning(f"Workflow file '{workflow_path}' not found")
+            return None
+
+    def _get_action_updates(self, all_actions: set[str]) -> dict[str, tuple[str, str]]:
+        """
+        Check all the actions for updates,
+        returns the updated action and pull request body line of each action
+        """
+        parsed_actions = []
+        action_updates: dict[str, tuple[str, str]] = {}
+
+        for action in sorted(all_actions):
+            try:
+                action_location, current_version = action.split("@", 1)
+                # A GitHub Action can be in a subdirectory of a repository
+                # e.g. `flatpak/flatpak-github-actions/flatpak-builder@v4`.
+                # we only need `user/repo` part from action_repository.
+                # Unpacking raises `ValueError` for actions without an owner
+                owner, repository_name = action_location.split("/", 2)[:2]
+                action_repository = f"{owner}/{repository_name}"
+            except ValueError:
+                gha_utils.notice(
+                    f'Action "{action}" is in an unsupported format. '
+                    "We only support community actions currently."
+                )
+                continue
+
+            # Do not replace a commit SHA pin with a release tag
+            if (
+                self.user_config.update_version_with
+                == UpdateVersionWith.LATEST_RELEASE_TAG
+                and self.commit_sha_regex.fullmatch(current_version)
             ):
-                file_data = file.read()
-                updated_workflow_data = file_data
-
-                try:
-                    workflow_data = yaml.load(file_data, Loader=yaml.FullLoader)
-                except yaml.YAMLError as exc:
-                    gha_utils.error(
-                        f"Error while parsing YAML from '{workflow_path}' file. "
-                        f"Reason: {exc}"
-                    )
-                    return updated_item_markdown_set
-
-                all_actions = set(self._get_all_actions(workflow_data))
-                # Remove ignored actions
-                all_actions.difference_update(self.user_config.ignore_actions)
-
-                for action in all_actions:
-                    try:
-                        action_location, current_version = action.split("@")
-                        # A GitHub Action can be in a subdirectory of a repository
-                        # e.g. `flatpak/flatpak-github-actions/flatpak-builder@v4`.
-                        # we only need `user/repo` part from action_repository
-                        action_repository = "/".join(action_location.split("/")[:2])
-                    except ValueError:
-                        gha_utils.notice(
-                            f'Action "{action}" is in an unsupported format. '
-                            "We only support community actions currently."
-                        )
-                        continue
-
-                    new_version, new_version_data = self._get_new_version(
-                        action_repository,
-                        current_version,
-                    )
+                gha_utils.notice(
+                    f'Action "{action}" is pinned to a commit SHA. Skipping...'
+                )
+                continue
+
+            parsed_actions.append(
+                (action, action_location, current_version, action_repository)
+            )
+
+        self._prefetch_github_api_data(
+            {parsed_action[3] for parsed_action in parsed_actions}
+        )
+
+        # Checking for updates is I/O bound,
+        # so the GitHub API requests are sent concurrently
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            new_versions = list(
+                executor.map(
+                    self._get_new_version,
+                    [parsed_action[3] for parsed_action in parsed_actions],
+                    [parsed_action[2] for parsed_action in parsed_actions],
+                )
+            )
+
+        for (action, action_location, _, action_repository), (
+            new_version,
+            new_version_data,
+        ) in zip(parsed_actions, new_versions):
+            if not new_version:
+                gha_utils.warning(
+                    f"Could not find any new version for {action}. Skipping..."
+                )
+                continue
+
+            updated_action = f"{action_location}@{new_version}"
+
+            if action != updated_action:
+                gha_utils.echo(f'Found new version for "{action_repository}"')
+                action_updates[action] = (
+                    updated_action,
+                    self._generate_updated_item_markdown(
+                        action_repository, new_version_data
+                    ),
+                )
+            else:
+                gha_utils.echo(f'No updates found for "{action_repository}"')
 
-                    if not new_version:
-                        gha_utils.warning(
-                            f"Could not find any new version for {action}. Skipping..."
-                        )
-                        continue
-
-                    updated_action = f"{action_location}@{new_version}"
-
-                    if action != updated_action:
-                        gha_utils.echo(f'Found new version for "{action_repository}"')
-                        updated_item_markdown_set.add(
-                            self._generate_updated_item_markdown(
-                                action_repository, new_version_data
-                            )
-                        )
-                        gha_utils.echo(
-                            f'Updating "{action}" with "{updated_action}"...'
-                        )
-                        updated_workflow_data = re.sub(
-                            rf"({action})(\s+['\"]?|['\"]?$)",
-                            rf"{updated_action}\2",
-                            updated_workflow_data,
-                            0,
-                            re.MULTILINE,
-                        )
-                    else:
-                        gha_utils.echo(f'No updates found for "{action_repository}"')
-
-                if updated_item_markdown_set:
-                    file.seek(0)
+        return action_updates
+
+    def _update_workflow(
+        self, workflow_path: str, file_data: str, updated_actions: dict[str, str]
+    ) -> None:
+        """Update the workflow file with the updated data"""
+        # Replace all the updated actions in a single pass over the workflow file
+        updated_actions_regex = re.compile(
+            r"(?<=[\s'\"])("
+            + "|".join(map(re.escape, updated_actions))
+            + r")(?=[\s'\",}\]]|$)"
+        )
+        updated_workflow_data = updated_actions_regex.sub(
+            lambda match: updated_actions[match.group(1)], file_data
+        )
+
+        # Write the workflow file only once, after all the updates are applied
+        if updated_workflow_data != file_data:
+            # Write to a temporary file and replace the workflow file with it,
+            # so that a workflow file is never left partially written.
+            # The real path is used to keep symlinked workflow files intact
+            real_workflow_path = os.path.realpath(workflow_path)
+            # A unique temporary file in the same directory, so that it can
+            # not clash with other writes or overwrite an existing file
+            temp_file_descriptor, temp_workflow_path = tempfile.mkstemp(
+                dir=os.path.dirname(real_workflow_path), suffix=".tmp"
+            )
+
+            try:
+                with open(temp_file_descriptor, "w") as file:
                     file.write(updated_workflow_data)
-                    file.truncate()
-        except FileNotFoundError:
-            gha_utils.warning(f"Workflow file '{workflow_path}' not found")
-        return updated_item_markdown_set
 
-    def _generate_updated_item_markdown(
-        self, action_repository: str, version_data: dict[str, str]
-    ) -> str:
-        """Generate pull request body line for pull request body"""
-        start = f"* **[{action_repository}]({self.github_url}{action_repository})**"
+                shutil.copymode(real_workflow_path, temp_workflow_path)
+                os.replace(temp_workflow_path, real_workflow_path)
+            except BaseException:
+                os.remove(temp_workflow_path)
+                raise
+
+    @cached_property
+    def _updated_item_markdown_template(self) -> str:
+        """Get the pull request body line template for the update mode"""
+        start = "* **[{action_repository}]({github_url}{action_repository})**"
 
         if self.user_config.update_version_with == UpdateVersionWith.LATEST_RELEASE_TAG:
             return (
                 f"{start} published a new release "
-                f"**[{version_data['tag_name']}]({version_data['html_url']})** "
-                f"on {version_data['published_at']}\n"
+                "**[{tag_name}]({html_url})** "
+                "on {published_at}\n"
             )
         elif (
             self.user_config.update_version_with
@@ -206,86 +336,338 @@ class GitHubActionsVersionUpdater:
         ):
             return (
                 f"{start} added a new "
-                f"**[commit]({version_data['commit_url']})** to "
-                f"**[{version_data['tag_name']}]({version_data['html_url']})** Tag "
-                f"on {version_data['commit_date']}\n"
+                "**[commit]({commit_url})** to "
+                "**[{tag_name}]({html_url})** Tag "
+                "on {commit_date}\n"
             )
         else:
             return (
                 f"{start} added a new "
-                f"**[commit]({version_data['commit_url']})** to "
-                f"**[{version_data['branch_name']}]({version_data['branch_url']})** "
-                f"branch on {version_data['commit_date']}\n"
+                "**[commit]({commit_url})** to "
+                "**[{branch_name}]({branch_url})** "
+                "branch on {commit_date}\n"
+            )
+
+    def _generate_updated_item_markdown(
+        self, action_repository: str, version_data: dict[str, str]
+    ) -> str:
+        """Generate pull request body line for pull request body"""
+        return self._updated_item_markdown_template.format_map(
+            {
+                **version_data,
+                "action_repository": action_repository,
+                "github_url": self.github_url,
+            }
+        )
+
+    def _get_api_data(
+        self, url: str, parse_data: Callable[[Any], Any]
+    ) -> tuple[int, Any]:
+        """
+        Get the data of a GitHub API URL using the API cache,
+        returns the status code and the parsed data (or the error response)
+        """
+        if url in self._prefetched_api_data:
+            return 200, self._prefetched_api_data[url]
+
+        if self.api_cache:
+            cached_data = self.api_cache.get(url)
+
+            if cached_data is not None:
+                return 200, cached_data
+
+        # Revalidate expired cache entries with a conditional request,
+        # "304 Not Modified" responses do not count against the rate limit
+        response = get_request_session(self.user_config.token).get(
+            url,
+            headers=(
+                self.api_cache.get_conditional_headers(url) if self.api_cache else None
+            ),
+            timeout=REQUEST_TIMEOUT,
+        )
+
+        if response.status_code == 304 and self.api_cache:
+            return 200, self.api_cache.refresh(url)
+
+        if response.status_code != 200:
+            return response.status_code, response.text
+
+        data = parse_data(orjson.loads(response.content))
+
+        if self.api_cache:
+            self.api_cache.set(
+                url,
+                data,
+                response.headers.get("ETag"),
+                response.headers.get("Last-Modified"),
+            )
+
+        return 200, data
+
+    def _get_github_releases_url(self, action_repository: str) -> str:
+        """Get the GitHub API URL of the releases of a repository"""
+        return f"{self.github_api_url}/repos/{action_repository}/releases?per_page=50"
+
+    def _get_commit_data_url(
+        self, action_repository: str, tag_or_branch_name: str
+    ) -> str:
+        """Get the GitHub API URL of the commits of a tag or branch"""
+        return (
+            f"{self.github_api_url}/repos"
+            f"/{action_repository}/commits?sha={tag_or_branch_name}&per_page=1"
+        )
+
+    def _get_repository_url(self, action_repository: str) -> str:
+        """Get the GitHub API URL of a repository"""
+        return f"{self.github_api_url}/repos/{action_repository}"
+
+    def _prefetch_github_api_data(self, action_repositories: set[str]) -> None:
+        """Fetch the data of all repositories using GitHub GraphQL API"""
+        # GitHub GraphQL API does not support unauthenticated requests
+        if not self.user_config.token:
+            return
+
+        get_url = (
+            self._get_repository_url
+            if self.user_config.update_version_with
+            == UpdateVersionWith.DEFAULT_BRANCH_COMMIT_SHA
+            else self._get_github_releases_url
+        )
+        # Fresh cache entries are used as they are, and expired entries
+        # with validators are revalidated with cheaper conditional requests
+        action_repositories_to_fetch = sorted(
+            action_repository
+            for action_repository in action_repositories
+            if not (
+                self.api_cache
+                and (
+                    self.api_cache.get(get_url(action_repository)) is not None
+                    or self.api_cache.get_conditional_headers(
+                        get_url(action_repository)
+                    )
+                )
+            )
+        )
+
+        for index in range(
+            0, len(action_repositories_to_fetch), self.graphql_batch_size
+        ):
+            self._prefetched_api_data.update(
+                self._get_github_api_data_from_graphql(
+                    action_repositories_to_fetch[
+                        index : index + self.graphql_batch_size
+                    ]
+                )
+            )
+
+        if self.api_cache:
+            for url, data in self._prefetched_api_data.items():
+                self.api_cache.update(url, data)
+
+    def _get_github_api_data_from_graphql(
+        self, action_repositories: list[str]
+    ) -> dict[str, Any]:
+        """
+        Get the data of multiple repositories in a single GitHub GraphQL API
+        request, returns the data in the same format as the GitHub REST API
+        keyed by the GitHub REST API URL
+        """
+        commit_fields = "oid url authoredDate"
+
+        if (
+            self.user_config.update_version_with
+            == UpdateVersionWith.DEFAULT_BRANCH_COMMIT_SHA
+        ):
+            repository_fields = (
+                "defaultBranchRef { name target { ... on Commit "
+                f"{{ {commit_fields} }}"
+                " } }"
+            )
+        else:
+            release_fields = "tagName url publishedAt isDraft isPrerelease"
+
+            if (
+                self.user_config.update_version_with
+                == UpdateVersionWith.LATEST_RELEASE_COMMIT_SHA
+            ):
+                release_fields += f" tagCommit {{ {commit_fields} }}"
+
+            repository_fields = (
+                "releases(first: 50, orderBy: {field: CREATED_AT, direction: DESC}) "
+                f"{{ nodes {{ {release_fields} }} }}"
+            )
+
+        variables: dict[str, str] = {}
+        repository_queries = []
+
+        for index, action_repository in enumerate(action_repositories):
+            owner, name = action_repository.split("/", 1)
+            variables[f"owner{index}"] = owner
+            variables[f"name{index}"] = name
+            repository_queries.append(
+                f"r{index}: repository(owner: $owner{index}, name: $name{index}) "
+                f"{{ {repository_fields} }}"
             )
 
+        query = (
+            "query("
+            + ", ".join(f"${variable}: String!" for variable in variables)
+            + ") {"
+            + " ".join(repository_queries)
+            + "}"
+        )
+
+        try:
+            response = get_request_session(self.user_config.token).post(
+                f"{self.github_api_url}/graphql",
+                data=orjson.dumps({"query": query, "variables": variables}),
+                headers={"Content-Type": "application/json"},
+                timeout=REQUEST_TIMEOUT,
+            )
+        except requests.RequestException:
+            # The REST API is used as a fallback, the request is not retried
+            response_data = None
+        else:
+            response_data = (
+                orjson.loads(response.content).get("data")
+                if response.status_code == 200
+                else None
+            )
+
+        if not response_data:
+            gha_utils.echo(
+                "Could not get repository data using GitHub GraphQL API, "
+                "falling back to GitHub REST API"
+            )
+            return {}
+
+        api_data: dict[str, Any] = {}
+
+        for index, action_repository in enumerate(action_repositories):
+            repository_data = response_data.get(f"r{index}")
+
+            # Repositories that were not found are
+            # looked up (and reported) using GitHub REST API
+            if repository_data is None:
+                continue
+
+            if "defaultBranchRef" in repository_data:
+                default_branch = repository_data["defaultBranchRef"]
+
+                if not default_branch:
+                    continue
+
+                default_branch_name = default_branch["name"]
+                commit_data_url = self._get_commit_data_url(
+                    action_repository, default_branch_name
+                )
+                api_data[self._get_repository_url(action_repository)] = (
+                    default_branch_name
+                )
+                api_data[commit_data_url] = self._get_commit_data_from_graphql(
+                    default_branch["target"]
+                )
+                continue
+
+            releases = [
+                release
+                for release in repository_data["releases"]["nodes"]
+                if not release["isDraft"] and not release["isPrerelease"]
+            ]
+            api_data[self._get_github_releases_url(action_repository)] = [
+                {
+                    "published_at": release["publishedAt"],
+                    "html_url": release["url"],
+                    "tag_name": release["tagName"],
+                }
+                for release in releases
+            ]
+
+            for release in releases:
+                if not release.get("tagCommit"):
+                    continue
+
+                commit_data_url = self._get_commit_data_url(
+                    action_repository, release["tagName"]
+                )
+                api_data[commit_data_url] = self._get_commit_data_from_graphql(
+                    release["tagCommit"]
+                )
+
+        return api_data
+
+    def _get_commit_data_from_graphql(self, commit: dict[str, str]) -> dict[str, str]:
+        """Convert GitHub GraphQL API commit data to the commit data format"""
+        return {
+            "commit_sha": commit["oid"],
+            "commit_url": commit["url"],
+            "commit_date": commit["authoredDate"],
+        }
+
+    # flake8: noqa: B019
+    @cache
     def _get_github_releases(
         self, action_repository: str
     ) -> list[dict[str, str | Version | LegacyVersion]]:
         """Get the GitHub releases using GitHub API"""
-        url = f"{self.github_api_url}/repos/{action_repository}/releases?per_page=50"
-
-        response = requests.get(
-            url, headers=get_request_headers(self.user_config.token)
+        status_code, response_data = self._get_api_data(
+            self._get_github_releases_url(action_repository),
+            # Only keep the fields we need, release notes can be quite large
+            lambda data: [
+                {
+                    "published_at": release["published_at"],
+                    "html_url": release["html_url"],
+                    "tag_name": release["tag_name"],
+                }
+                for release in data
+                if not release["prerelease"]
+            ],
         )
 
-        if response.status_code == 200:
-            response_data = response.json()
-
-            if response_data:
-                releases = [
-                    {
-                        "published_at": release["published_at"],
-                        "html_url": release["html_url"],
-                        "tag_name": release["tag_name"],
-                        "tag_name_parsed": parse(release["tag_name"]),
-                    }
-                    for release in response_data
-                    if not release["prerelease"]
-                ]
-                # Sort through the releases returned by GitHub API using tag_name
-                return sorted(
-                    releases,
-                    key=lambda r: r["tag_name_parsed"],
-                    reverse=True,
-                )
+        if status_code != 200:
+            gha_utils.warning(
+                f"Could not find any release for "
+                f'"{action_repository}", GitHub API Response: {response_data}'
+            )
+            return []
 
-        gha_utils.warning(
-            f"Could not find any release for "
-            f'"{action_repository}", GitHub API Response: {response.json()}'
+        if not response_data:
+            gha_utils.warning(f'Could not find any release for "{action_repository}"')
+            return []
+
+        releases = [
+            {
+                **release,
+                "tag_name_parsed": parse_version(release["tag_name"]),
+            }
+            for release in response_data
+        ]
+        # Sort through the releases returned by GitHub API using tag_name
+        return sorted(
+            releases,
+            key=itemgetter("tag_name_parsed"),
+            reverse=True,
         )
-        return []
 
     @cached_property
     def _release_filter_function(self):
         """Get the release filter function"""
-        if self.user_config.release_types == [
-            ReleaseType.MAJOR,
-            ReleaseType.MINOR,
-            ReleaseType.PATCH,
-        ]:
-            return lambda r, c: True
-
-        checks = []
+        # The release types are fixed for the whole run, so they are checked once
+        # here instead of for every release
+        check_major = ReleaseType.MAJOR in self.user_config.release_types
+        check_minor = ReleaseType.MINOR in self.user_config.release_types
+        check_patch = ReleaseType.PATCH in self.user_config.release_types
 
-        if ReleaseType.MAJOR in self.user_config.release_types:
-            checks.append(lambda r, c: r.major > c.major)
+        # `LegacyVersion` release tags raise `AttributeError`,
+        # which is handled by the caller
+        def filter_func(release_tag: Any, current_version: Version) -> bool:
+            if release_tag.major != current_version.major:
+                return check_major and release_tag.major > current_version.major
 
-        if ReleaseType.MINOR in self.user_config.release_types:
-            checks.append(
-                lambda r, c: r.major == c.major and r.minor > c.minor,
-            )
-
-        if ReleaseType.PATCH in self.user_config.release_types:
-            checks.append(
-                lambda r, c: r.major == c.major
-                and r.minor == c.minor
-                and r.micro > c.micro
-            )
+            if release_tag.minor != current_version.minor:
+                return check_minor and release_tag.minor > current_version.minor
 
-        def filter_func(
-            release_tag: LegacyVersion | Version, current_version: Version
-        ) -> bool:
-            return any(check(release_tag, current_version) for check in checks)
+            return check_patch and release_tag.micro > current_version.micro
 
         return filter_func
 
@@ -299,7 +681,7 @@ class GitHubActionsVersionUpdater:
         if not github_releases:
             return latest_release
 
-        parsed_current_version: LegacyVersion | Version = parse(current_version)
+        parsed_current_version: LegacyVersion | Version = parse_version(current_version)
 
         if isinstance(parsed_current_version, LegacyVersion):
             gha_utils.warning(
@@ -329,48 +711,45 @@ class GitHubActionsVersionUpdater:
 
         return latest_release
 
+    # flake8: noqa: B019
+    @cache
     def _get_commit_data(
         self, action_repository: str, tag_or_branch_name: str
     ) -> dict[str, str]:
         """Get the commit Data for Tag or Branch using GitHub API"""
-        url = (
-            f"{self.github_api_url}/repos"
-            f"/{action_repository}/commits?sha={tag_or_branch_name}"
+        status_code, response_data = self._get_api_data(
+            self._get_commit_data_url(action_repository, tag_or_branch_name),
+            lambda data: {
+                "commit_sha": data[0]["sha"],
+                "commit_url": data[0]["html_url"],
+                "commit_date": data[0]["commit"]["author"]["date"],
+            },
         )
 
-        response = requests.get(
-            url, headers=get_request_headers(self.user_config.token)
-        )
-
-        if response.status_code == 200:
-            response_data = response.json()[0]
-
-            return {
-                "commit_sha": response_data["sha"],
-                "commit_url": response_data["html_url"],
-                "commit_date": response_data["commit"]["author"]["date"],
-            }
+        if status_code == 200:
+            return response_data
 
         gha_utils.warning(
             f"Could not find commit data for tag/branch {tag_or_branch_name} on "
-            f'"{action_repository}", GitHub API Response: {response.json()}'
+            f'"{action_repository}", GitHub API Response: {response_data}'
         )
         return {}
 
+    # flake8: noqa: B019
+    @cache
     def _get_default_branch_name(self, action_repository: str) -> str | None:
         """Get the Action Repository's Default Branch Name using GitHub API"""
-        url = f"{self.github_api_url}/repos/{action_repository}"
-
-        response = requests.get(
-            url, headers=get_request_headers(self.user_config.token)
+        status_code, response_data = self._get_api_data(
+            self._get_repository_url(action_repository),
+            lambda data: data["default_branch"],
         )
 
-        if response.status_code == 200:
-            return response.json()["default_branch"]
+        if status_code == 200:
+            return response_data
 
         gha_utils.warning(
             f"Could not find default branch for "
-            f'"{action_repository}", GitHub API Response: {response.json()}'
+            f'"{action_repository}", GitHub API Response: {response_data}'
         )
         return None
 
@@ -435,49 +814,164 @@ class GitHubActionsVersionUpdater:
 
     def _get_workflow_paths_from_api(self) -> set[str]:
         """Get all workflows of the repository using GitHub API"""
-        url = f"{self.github_api_url}/repos/{self.env.repository}/actions/workflows"
-
-        response = requests.get(
-            url, headers=get_request_headers(self.user_config.token)
+        url: str | None = (
+            f"{self.github_api_url}/repos/{self.env.repository}"
+            "/actions/workflows?per_page=100"
         )
+        workflow_paths: set[str] = set()
 
-        if response.status_code == 200:
-            return {workflow["path"] for workflow in response.json()["workflows"]}
+        # Follow the pagination links, repositories can have
+        # more workflows than fit in a single page
+        while url:
+            response = get_request_session(self.user_config.token).get(
+                url, timeout=REQUEST_TIMEOUT
+            )
 
-        gha_utils.error(
-            f"An error occurred while getting workflows for"
-            f"{self.env.repository}, GitHub API Response: {response.json()}"
-        )
-        return set()
+            if response.status_code != 200:
+                gha_utils.error(
+                    f"An error occurred while getting workflows for"
+                    f"{self.env.repository}, GitHub API Response: {response.text}"
+                )
+                break
+
+            workflow_paths.update(
+                workflow["path"]
+                for workflow in orjson.loads(response.content)["workflows"]
+            )
+            url = response.links.get("next", {}).get("url")
+
+        return workflow_paths
+
+    def _get_workflow_paths_from_workspace(self) -> set[str]:
+        """Get all workflows of the repository from the checked out workflows"""
+        try:
+            with os.scandir(self.workflow_directory) as entries:
+                return {
+                    os.path.join(self.workflow_directory, entry.name)
+                    for entry in entries
+                    if entry.name.endswith(YAML_FILE_SUFFIXES) and entry.is_file()
+                }
+        except OSError:
+            return set()
 
     def _get_workflow_paths(self) -> set[str]:
         """Get all workflows of the repository"""
-        workflow_paths = self._get_workflow_paths_from_api()
+        # The repository is checked out in the workspace, so the workflows
+        # are read from disk. Fall back to GitHub API if none are found
+        workflow_paths = (
+            self._get_workflow_paths_from_workspace()
+            or self._get_workflow_paths_from_api()
+        )
         workflow_paths.update(self.user_config.extra_workflow_locations)
 
         if not workflow_paths:
             raise SystemExit(1)
 
-        return workflow_paths
+        # The same file can be found through different paths
+        # (e.g. `.github/workflows/ci.yml` and `./.github/workflows/ci.yml`),
+        # keep a single path for each file so it is only updated once
+        unique_workflow_paths: dict[str, str] = {}
+
+        for workflow_path in sorted(workflow_paths):
+            unique_workflow_paths.setdefault(
+                os.path.realpath(workflow_path), workflow_path
+            )
+
+        return set(unique_workflow_paths.values())
+
+    def _get_workflow_actions(self, workflow_path: str, file_data: str) -> set[str]:
+        """Get all action names used in the workflow file"""
+        # Workflows that do not use any actions do not need to be parsed
+        if self.workflow_action_key not in file_data:
+            return set()
+
+        # PyYAML is only needed here, so it is imported lazily
+        import yaml
+
+        try:
+            workflow_data = yaml.load(file_data, Loader=self._yaml_loader)
+        except yaml.YAMLError as exc:
+            gha_utils.error(
+                f"Error while parsing YAML from '{workflow_path}' file. "
+                f"Reason: {exc}"
+            )
+            return set()
+
+        return set(self._get_all_actions(workflow_data))
+
+    @cached_property
+    def _yaml_loader(self) -> Any:
+        """Get the fastest available safe YAML loader"""
+        try:
+            # Use LibYAML based loader if available, it is much faster
+            from yaml import CSafeLoader
+
+            return CSafeLoader
+        except ImportError:
+            from yaml import SafeLoader
+
+            gha_utils.warning(
+                "LibYAML is not available, "
+                "falling back to the slower pure Python YAML parser."
+            )
+            return SafeLoader
 
     def _get_all_actions(self, data: Any) -> Generator[str, None, None]:
-        """Recursively get all action names from workflow data"""
-        if isinstance(data, dict):
-            for key, value in data.items():
-                if key == self.workflow_action_key:
-                    yield value
-                elif isinstance(value, dict) or isinstance(value, list):
-                    yield from self._get_all_actions(value)
+        """Get all action names from workflow data"""
+        if not isinstance(data, dict) or not (
+            isinstance(data.get("jobs"), dict) or isinstance(data.get("runs"), dict)
+        ):
+            yield from self._walk_all_actions(data)
+            return
+
+        # Actions can only be used by jobs (reusable workflows), job steps
+        # and composite action steps, so only those are checked
+        jobs = list(data["jobs"].values()) if isinstance(data.get("jobs"), dict) else []
+
+        if isinstance(data.get("runs"), dict):
+            jobs.append(data["runs"])
+
+        for job in jobs:
+            if not isinstance(job, dict):
+                continue
+
+            if isinstance(job.get(self.workflow_action_key), str):
+                yield job[self.workflow_action_key]
+
+            steps = job.get("steps")
+
+            if not isinstance(steps, list):
+                continue
+
+            for step in steps:
+                if isinstance(step, dict) and isinstance(
+                    step.get(self.workflow_action_key), str
+                ):
+                    yield step[self.workflow_action_key]
 
-        elif isinstance(data, list):
-            for element in data:
-                yield from self._get_all_actions(element)
+    def _walk_all_actions(self, data: Any) -> Generator[str, None, None]:
+        """Get all action names from any part of the workflow data"""
+        # Walk the workflow data with an explicit stack instead of recursion
+        stack = [data]
+
+        while stack:
+            node = stack.pop()
+
+            if isinstance(node, dict):
+                for key, value in node.items():
+                    if key == self.workflow_action_key:
+                        yield value
+                    elif isinstance(value, (dict, list)):
+                        stack.append(value)
+
+            elif isinstance(node, list):
+                stack.extend(node)
 
 
 if __name__ == "__main__":
     with gha_utils.group("Parse Configuration"):
         user_configuration = Configuration()
-        action_environment = ActionEnvironment()
+        action_environment = ActionEnvironment.from_env()
 
         gha_utils.echo("Using Configuration:")
         gha_utils.echo(user_configuration.model_dump_json(exclude={"token"}, indent=4))
@@ -485,17 +979,39 @@ if __name__ == "__main__":
     # Configure Git Safe Directory
     configure_safe_directory(action_environment.workspace)
 
-    # Configure Git Author
-    configure_git_author(
-        user_configuration.committer_username,
-        user_configuration.committer_email,
+    actions_version_updater = GitHubActionsVersionUpdater(
+        action_environment,
+        user_configuration,
     )
 
-    with gha_utils.group("Run GitHub Actions Version Updater"):
-        actions_version_updater = GitHubActionsVersionUpdater(
-            action_environment,
-            user_configuration,
-        )
-        actions_version_updater.run()
+    # Fetch the latest release in the background while the updater runs,
+    # it is only displayed at the end. A daemon thread is used so that
+    # the informational request never keeps the process alive
+    latest_release_future: Future[dict[str, Any] | None] = Future()
+
+    def fetch_latest_release() -> None:
+        """Fetch the latest release, a failure only skips what's new"""
+        try:
+            latest_release = get_latest_release(actions_version_updater.api_cache)
+        except Exception:
+            latest_release = None
+
+        latest_release_future.set_result(latest_release)
+
+    threading.Thread(target=fetch_latest_release, daemon=True).start()
+
+    try:
+        with gha_utils.group("Run GitHub Actions Version Updater"):
+            actions_version_updater.run()
+    finally:
+        try:
+            latest_release = latest_release_future.result(timeout=5)
+        except FutureTimeoutError:
+            latest_release = None
+
+        # The cache is saved after the latest release is fetched,
+        # so that it includes the latest release data as well
+        if actions_version_updater.api_cache:
+            actions_version_updater.api_cache.save()
 
-    display_whats_new()
+    display_whats_new(latest_release)
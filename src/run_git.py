@@ -1,20 +1,9 @@
 import subprocess
+from typing import IO
 
 import github_action_utils as gha_utils  # type: ignore
 
 
-def configure_git_author(username: str, email: str) -> None:
-    """
-    Configure the git author.
-    """
-    with gha_utils.group("Configure Git Author"):
-        gha_utils.notice(f"Setting Git Commit User to '{username}'.")
-        gha_utils.notice(f"Setting Git Commit email to '{email}'.")
-
-        run_subprocess_command(["git", "config", "user.name", username])
-        run_subprocess_command(["git", "config", "user.email", email])
-
-
 def configure_safe_directory(directory: str) -> None:
     """
     Configure git safe.directory.
@@ -32,13 +21,17 @@ def create_new_git_branch(base_branch_name: str, new_branch_name: str) -> None:
     with gha_utils.group(
         f"Create New Branch ({base_branch_name} -> {new_branch_name})"
     ):
-        run_subprocess_command(["git", "checkout", base_branch_name])
-        run_subprocess_command(["git", "checkout", "-b", new_branch_name])
+        # Create and switch to the new branch in a single git call,
+        # the uncommitted workflow changes are carried over to it
+        run_subprocess_command(
+            ["git", "checkout", "-b", new_branch_name, base_branch_name]
+        )
 
 
 def git_commit_changes(
     commit_message: str,
-    commit_author: str,
+    committer_username: str,
+    committer_email: str,
     commit_branch_name: str,
     force_push: bool = False,
 ) -> None:
@@ -46,9 +39,24 @@ def git_commit_changes(
     Commit the changed files.
     """
     with gha_utils.group("Commit Changes"):
-        run_subprocess_command(["git", "add", "."])
+        gha_utils.notice(f"Setting Git Commit User to '{committer_username}'.")
+        gha_utils.notice(f"Setting Git Commit email to '{committer_email}'.")
+
+        # The committer is passed to the commit itself instead of
+        # being configured with separate `git config` calls.
+        # Only existing workflow files are updated, so `-a` stages all changes
         run_subprocess_command(
-            ["git", "commit", f"--author={commit_author}", "-m", commit_message]
+            [
+                "git",
+                "-c",
+                f"user.name={committer_username}",
+                "-c",
+                f"user.email={committer_email}",
+                "commit",
+                "-a",
+                "-m",
+                commit_message,
+            ]
         )
         push_command = ["git", "push", "-u"]
 
@@ -63,16 +71,22 @@ def git_has_changes() -> bool:
     """
     Check if there are changes to commit.
     """
-    try:
-        subprocess.check_output(["git", "diff", "--exit-code"])
-        return False
-    except subprocess.CalledProcessError:
-        return True
+    # `--quiet` makes git exit on the first change without generating the diff
+    return (
+        subprocess.call(
+            ["git", "diff", "--quiet"],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        != 0
+    )
 
 
-def git_diff() -> str:
-    """Return the git diff"""
-    return subprocess.run(["git", "diff"], capture_output=True, text=True).stdout
+def write_git_diff(output_file: IO[str]) -> None:
+    """Write the git diff to a file"""
+    # git writes to the file directly, the diff is never loaded into memory
+    output_file.flush()
+    subprocess.run(["git", "diff"], stdout=output_file)
 
 
 def run_subprocess_command(command: list[str]) -> None:
@@ -1,9 +1,33 @@
+import os
+import time
 from functools import cache
+from itertools import chain
+from typing import Any
 
 import github_action_utils as gha_utils  # type: ignore
+import orjson
 import requests
+from packaging.version import LegacyVersion, Version, parse
+from requests.adapters import HTTPAdapter
+from requests.hooks import default_hooks
+from urllib3.util.retry import Retry
 
-from .run_git import git_diff
+from .cache import GitHubAPICache
+from .run_git import write_git_diff
+
+GITHUB_API_URL = "https://api.github.com"
+
+# Latest release of GitHub Actions Version Updater, shown as what's new
+LATEST_RELEASE_URL = (
+    f"{GITHUB_API_URL}/repos/saadmk11/github-actions-version-updater/releases/latest"
+)
+
+# Connect and read timeouts (in seconds) of GitHub API requests,
+# so that a stalled connection can not hang the workflow run
+REQUEST_TIMEOUT = (5, 30)
+
+# Longest time (in seconds) to wait for a GitHub API rate limit to reset
+MAX_RATE_LIMIT_WAIT = 5 * 60
 
 
 @cache
@@ -17,6 +41,79 @@ def get_request_headers(github_token: str | None = None) -> dict[str, str]:
     return headers
 
 
+@cache
+def get_request_session(
+    github_token: str | None = None, wait_for_rate_limit: bool = True
+) -> requests.Session:
+    """Get a shared session for GitHub API requests"""
+    session = requests.Session()
+    session.headers.update(get_request_headers(github_token))
+    # Re-use connections to the GitHub API and
+    # retry requests that failed because of transient server errors
+    # or secondary rate limits (honouring the `Retry-After` header)
+    adapter = HTTPAdapter(
+        pool_maxsize=16,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=[429, 502, 503, 504],
+            raise_on_status=False,
+        ),
+    )
+    session.mount("https://", adapter)
+
+    if not wait_for_rate_limit:
+        return session
+
+    def handle_rate_limit(
+        response: requests.Response, *args: Any, **kwargs: Any
+    ) -> requests.Response | None:
+        """Wait for the primary GitHub API rate limit to reset when it is exhausted"""
+        # Secondary rate limits (`Retry-After`) are handled by the `Retry` adapter
+        if response.headers.get("X-RateLimit-Remaining") != "0":
+            return None
+
+        try:
+            wait_time = float(response.headers["X-RateLimit-Reset"]) - time.time()
+        except (KeyError, ValueError):
+            return None
+
+        if wait_time <= 0:
+            return None
+
+        if wait_time > MAX_RATE_LIMIT_WAIT:
+            gha_utils.warning(
+                "GitHub API rate limit exceeded, "
+                f"it will be reset in {wait_time:.0f} seconds."
+            )
+            return None
+
+        gha_utils.echo(
+            f"GitHub API rate limit exceeded, waiting {wait_time:.0f} seconds..."
+        )
+        time.sleep(wait_time)
+
+        # Only the rate limited request needs to be sent again,
+        # a successful response that used the last request of the limit is kept
+        if response.status_code in (403, 429):
+            # The request is sent again without this hook, so it is only retried once
+            request = response.request.copy()
+            request.hooks = default_hooks()
+            return session.send(request, timeout=REQUEST_TIMEOUT)
+
+        return None
+
+    session.hooks["response"].append(handle_rate_limit)
+
+    return session
+
+
+@cache
+def parse_version(version: str) -> LegacyVersion | Version:
+    """Parse a version string (cached, the same tags are parsed repeatedly)"""
+    return parse(version)
+
+
 def create_pull_request(
     pull_request_title: str,
     repository_name: str,
@@ -27,7 +124,7 @@ def create_pull_request(
 ) -> int | None:
     """Create pull request on GitHub"""
     with gha_utils.group("Create Pull Request"):
-        url = f"https://api.github.com/repos/{repository_name}/pulls"
+        url = f"{GITHUB_API_URL}/repos/{repository_name}/pulls"
         payload = {
             "title": pull_request_title,
             "head": head_branch_name,
@@ -35,12 +132,15 @@ def create_pull_request(
             "body": body,
         }
 
-        response = requests.post(
-            url, json=payload, headers=get_request_headers(github_token)
+        response = get_request_session(github_token).post(
+            url,
+            data=orjson.dumps(payload),
+            headers={"Content-Type": "application/json"},
+            timeout=REQUEST_TIMEOUT,
         )
 
         if response.status_code == 201:
-            response_data = response.json()
+            response_data = orjson.loads(response.content)
             gha_utils.notice(
                 f"Pull request opened at {response_data['html_url']} \U0001F389"
             )
@@ -55,7 +155,7 @@ def create_pull_request(
 
         gha_utils.error(
             f"Could not create a pull request on "
-            f"{repository_name}, GitHub API Response: {response.json()}"
+            f"{repository_name}, GitHub API Response: {response.text}"
         )
         raise SystemExit(1)
 
@@ -72,35 +172,38 @@ def add_pull_request_reviewers(
         payload = {}
 
         if pull_request_user_reviewers:
-            payload["reviewers"] = list(pull_request_user_reviewers)
+            payload["reviewers"] = pull_request_user_reviewers
 
         if pull_request_team_reviewers:
-            payload["team_reviewers"] = list(pull_request_team_reviewers)
+            payload["team_reviewers"] = pull_request_team_reviewers
 
         if not payload:
             gha_utils.echo("No reviewers were requested.")
             return
 
         url = (
-            f"https://api.github.com/repos/{repository_name}/pulls"
+            f"{GITHUB_API_URL}/repos/{repository_name}/pulls"
             f"/{pull_request_number}/requested_reviewers"
         )
 
-        response = requests.post(
-            url, json=payload, headers=get_request_headers(github_token)
+        response = get_request_session(github_token).post(
+            url,
+            # `default=list` serializes the frozensets as JSON arrays
+            data=orjson.dumps(payload, default=list),
+            headers={"Content-Type": "application/json"},
+            timeout=REQUEST_TIMEOUT,
         )
 
         if response.status_code == 201:
-            gha_utils.notice(
-                "Requested review from "
-                f"{pull_request_user_reviewers.union(pull_request_team_reviewers)} "
-                "\U0001F389"
+            reviewers = ", ".join(
+                chain(pull_request_user_reviewers, pull_request_team_reviewers)
             )
+            gha_utils.notice(f"Requested review from {reviewers} \U0001F389")
             return
 
         gha_utils.error(
             f"Could not request reviews on pull request #{pull_request_number} "
-            f"on {repository_name}, GitHub API Response: {response.json()}"
+            f"on {repository_name}, GitHub API Response: {response.text}"
         )
 
 
@@ -116,52 +219,93 @@ def add_pull_request_labels(
             gha_utils.echo("No labels to add.")
             return
 
-        payload = {"labels": list(labels)}
+        payload = {"labels": labels}
 
         url = (
-            f"https://api.github.com/repos/{repository_name}/issues"
+            f"{GITHUB_API_URL}/repos/{repository_name}/issues"
             f"/{pull_request_number}/labels"
         )
 
-        response = requests.post(
-            url, json=payload, headers=get_request_headers(github_token)
+        response = get_request_session(github_token).post(
+            url,
+            data=orjson.dumps(payload, default=list),
+            headers={"Content-Type": "application/json"},
+            timeout=REQUEST_TIMEOUT,
         )
 
         if response.status_code == 200:
             gha_utils.notice(
-                f"Added '{labels}' labels to "
+                f"Added '{', '.join(labels)}' labels to "
                 f"pull request #{pull_request_number} \U0001F389"
             )
             return
 
         gha_utils.error(
             f"Could not add labels to pull request #{pull_request_number} "
-            f"on {repository_name}, GitHub API Response: {response.json()}"
+            f"on {repository_name}, GitHub API Response: {response.text}"
         )
 
 
 def add_git_diff_to_job_summary() -> None:
     """Add git diff to job summary"""
-    markdown_diff = (
-        "<details>"
-        "<summary>Git Diff</summary>"
-        f"\n\n```diff\n{git_diff()}```\n\n"
-        "</details>"
-    )
-    gha_utils.append_job_summary(markdown_diff)
+    # The diff can be large, so it is streamed into the job summary file
+    with open(os.environ["GITHUB_STEP_SUMMARY"], "a") as file:
+        file.write("<details><summary>Git Diff</summary>\n\n```diff\n")
+        write_git_diff(file)
+        file.write("```\n\n</details>\n")
+
+
+def get_latest_release(
+    api_cache: GitHubAPICache | None = None,
+) -> dict[str, Any] | None:
+    """Get the Latest Release of GitHub Actions Version Updater"""
+    url = LATEST_RELEASE_URL
+
+    if api_cache:
+        cached_data = api_cache.get(url)
+
+        if cached_data is not None:
+            return cached_data
+
+    try:
+        # The informational request should never wait for a rate limit reset
+        response = get_request_session(wait_for_rate_limit=False).get(
+            url,
+            headers=api_cache.get_conditional_headers(url) if api_cache else None,
+            timeout=REQUEST_TIMEOUT,
+        )
+    except requests.RequestException:
+        # What's new is only informational, it should never fail the run
+        return None
+
+    if response.status_code == 304 and api_cache:
+        return api_cache.refresh(url)
+
+    if response.status_code != 200:
+        return None
+
+    response_data = orjson.loads(response.content)
+    # Only keep the fields that are displayed
+    latest_release = {
+        "tag_name": response_data["tag_name"],
+        "html_url": response_data["html_url"],
+        "body": response_data["body"],
+    }
+
+    if api_cache:
+        api_cache.set(
+            url,
+            latest_release,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        )
 
+    return latest_release
 
-def display_whats_new() -> None:
-    """Print what's new in GitHub Actions Version Updater Latest Version"""
-    url = (
-        "https://api.github.com/repos"
-        "/saadmk11/github-actions-version-updater"
-        "/releases/latest"
-    )
-    response = requests.get(url)
 
-    if response.status_code == 200:
-        response_data = response.json()
+def display_whats_new(response_data: dict[str, Any] | None) -> None:
+    """Print what's new in GitHub Actions Version Updater Latest Version"""
+    if response_data:
         latest_release_tag = response_data["tag_name"]
         latest_release_html_url = response_data["html_url"]
         latest_release_body = response_data["body"]